@@ -0,0 +1,100 @@
+import json
+import logging
+from typing import Any
+
+import redis.asyncio as redis
+from fastapi.encoders import jsonable_encoder
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Caching is optional: without a configured REDIS_URL every lookup is a miss and
+# writes are no-ops, so the API works unchanged against the database alone.
+redis_client = redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+USER_CREDITS_PREFIX = "user_credits:"
+YEAR_PERFORMANCE_PREFIX = "year_perf:"
+
+
+def user_credits_key(user_id: int) -> str:
+    """
+    Returns the cache key of the credits of a user.
+    """
+    return f"{USER_CREDITS_PREFIX}{user_id}"
+
+
+def year_performance_key(year: int) -> str:
+    """
+    Returns the cache key of the performance data of a year.
+    """
+    return f"{YEAR_PERFORMANCE_PREFIX}{year}"
+
+
+async def get_cached(key: str) -> Any | None:
+    """
+    Retrieves a JSON value from the cache.
+
+    Args:
+        key (str): The cache key.
+
+    Returns:
+        Any | None: The decoded value, or None on a miss or if Redis is unavailable.
+    """
+    if redis_client is None:
+        return None
+    try:
+        cached = await redis_client.get(key)
+    except redis.RedisError:
+        logger.warning("Cache read failed for %s", key, exc_info=True)
+        return None
+    return json.loads(cached) if cached is not None else None
+
+
+async def set_cached(key: str, value: Any, ttl: int) -> None:
+    """
+    Stores a value in the cache as JSON.
+
+    Args:
+        key (str): The cache key.
+        value (Any): The value to store; it is encoded like a FastAPI response.
+        ttl (int): The time to live of the entry, in seconds.
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(key, json.dumps(jsonable_encoder(value)), ex=ttl)
+    except redis.RedisError:
+        logger.warning("Cache write failed for %s", key, exc_info=True)
+
+
+async def invalidate(*keys: str) -> None:
+    """
+    Removes entries from the cache.
+
+    Args:
+        *keys (str): The cache keys to remove.
+    """
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except redis.RedisError:
+        logger.warning("Cache invalidation failed for %s", keys, exc_info=True)
+
+
+async def invalidate_prefix(*prefixes: str) -> None:
+    """
+    Removes all entries whose keys start with one of the given prefixes.
+
+    Args:
+        *prefixes (str): The key prefixes of the entries to remove.
+    """
+    if redis_client is None:
+        return
+    try:
+        for prefix in prefixes:
+            keys = [key async for key in redis_client.scan_iter(match=f"{prefix}*")]
+            if keys:
+                await redis_client.delete(*keys)
+    except redis.RedisError:
+        logger.warning("Cache invalidation failed for %s", prefixes, exc_info=True)
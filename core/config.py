@@ -10,6 +10,13 @@ class Settings:
     DB_NAME: str = os.getenv("DB_NAME", "credits_fastapi")
     DB_USER: str = os.getenv("DB_USER", "sa")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "securepassword1234")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_FAST_EXECUTEMANY: bool = os.getenv("DB_FAST_EXECUTEMANY", "1") == "1"
+    AUTO_CREATE_TABLES: bool = os.getenv("AUTO_CREATE_TABLES", "0") == "1"
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
 
 
 settings = Settings()
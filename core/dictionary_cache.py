@@ -0,0 +1,72 @@
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache import YEAR_PERFORMANCE_PREFIX, invalidate_prefix
+from models.dictionary import Dictionary
+
+# Each worker process holds its own copy of the mapping, so it is reloaded after
+# this many seconds to pick up changes reloaded by another worker.
+DICTIONARY_TTL = 300
+
+# A name missing from the mapping reloads it, at most once per this many seconds,
+# so entries imported after startup are found without a query on every miss.
+DICTIONARY_MISS_RELOAD_INTERVAL = 5
+
+_NAME_TO_ID: dict[str, int] = {}
+_loaded_at: float | None = None
+
+
+async def load_dictionary(db: AsyncSession) -> int:
+    """
+    (Re)loads the whole dictionary table into the in-memory name to ID mapping.
+
+    Called at application startup, whenever the dictionary table changes, once
+    the loaded mapping is older than `DICTIONARY_TTL` seconds and on misses. When
+    the mapping changes, the cached year performance is dropped, as it was
+    computed with the previous plan categories.
+
+    Args:
+        db (AsyncSession): The database session used to load the dictionary.
+
+    Returns:
+        int: The number of dictionary entries loaded.
+    """
+    global _loaded_at
+    result = await db.execute(select(Dictionary.name, Dictionary.id))
+    entries = dict(result.all())
+    changed = entries != _NAME_TO_ID
+    _NAME_TO_ID.clear()
+    _NAME_TO_ID.update(entries)
+    _loaded_at = time.monotonic()
+    if changed:
+        await invalidate_prefix(YEAR_PERFORMANCE_PREFIX)
+    return len(entries)
+
+
+async def type_id(db: AsyncSession, name: str) -> int | None:
+    """
+    Resolves a dictionary entry name (e.g. "body" or "issuance") to its ID.
+
+    The whole dictionary table is kept in a module-level mapping, loaded at startup
+    and served from memory afterwards, since it is a tiny lookup table that is
+    practically never written to. The mapping is reloaded once it is older than
+    `DICTIONARY_TTL` seconds, or on a miss once it is older than
+    `DICTIONARY_MISS_RELOAD_INTERVAL` seconds, so a missing entry costs at most
+    one query per interval.
+
+    Args:
+        db (AsyncSession): The database session used to (re)load the dictionary.
+        name (str): The name of the dictionary entry.
+
+    Returns:
+        int | None: The ID of the dictionary entry, or None if it does not exist.
+    """
+    age = None if _loaded_at is None else time.monotonic() - _loaded_at
+    if (
+        age is None
+        or age > DICTIONARY_TTL
+        or (name not in _NAME_TO_ID and age > DICTIONARY_MISS_RELOAD_INTERVAL)
+    ):
+        await load_dictionary(db)
+    return _NAME_TO_ID.get(name)
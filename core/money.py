@@ -0,0 +1,18 @@
+from decimal import Decimal
+
+# Money amounts are stored as integer cents, so sums are integer arithmetic in the
+# database; they are only turned into decimals at the API boundary.
+CENTS_PER_UNIT = 100
+
+
+def from_cents(cents: int | None) -> Decimal:
+    """
+    Converts an amount of cents to a decimal amount, e.g. 1430 to Decimal("14.30").
+
+    Args:
+        cents (int | None): The amount in cents; None is treated as 0.
+
+    Returns:
+        Decimal: The amount with two decimal places.
+    """
+    return Decimal(int(cents or 0)).scaleb(-2)
@@ -1,273 +1,335 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, with_expression
+from sqlalchemy import (
+    Date,
+    and_,
+    bindparam,
+    case,
+    cast,
+    func,
+    insert,
+    literal_column,
+    select,
+    update,
+)
 from models.payments import Payments
 from models.dictionary import Dictionary
 from models.credits import Credits
+from models.users import User  # noqa: F401 - registers the model Credits relates to
 from datetime import date
+from decimal import Decimal
 from models.plans import Plans
 from sqlalchemy import extract
-
-
-def get_credits_by_user_id(db: Session, user_id: int):
+from core.dictionary_cache import type_id
+from core.money import from_cents
+from db_operations.procedures import CALL_YEAR_PERFORMANCE
+
+# The statements of the hot API queries are built once at import time and only
+# receive their values as bound parameters, so SQLAlchemy's compiled cache is
+# hit on every call instead of rebuilding the statement for each request.
+_TODAY = cast(func.getdate(), Date)
+_OVERDUE_DAYS = case(
+    (
+        Credits.return_date < _TODAY,
+        func.datediff(literal_column("day"), Credits.return_date, _TODAY),
+    ),
+    else_=0,
+)
+# Credits are read without taking shared locks, so polling users' credits does
+# not block on, or hold up, payment imports rewriting the paid totals. A read
+# may see the totals of an import that is still running.
+_CREDITS_BY_USER = (
+    select(Credits)
+    .with_hint(Credits, "WITH (NOLOCK)", "mssql")
+    .options(with_expression(Credits.overdue_days, _OVERDUE_DAYS))
+    .where(Credits.user_id == bindparam("user_id"))
+    .order_by(Credits.id)
+)
+_CREDITS_WITH_PAYMENTS_BY_USER = _CREDITS_BY_USER.options(
+    selectinload(Credits.payments)
+)
+_EXISTING_PLAN_KEYS = select(Plans.period, Plans.category_id).where(
+    Plans.period.between(bindparam("first_period"), bindparam("last_period"))
+)
+
+
+async def get_credits_by_user_id(
+    db: AsyncSession, user_id: int, load_payments: bool = False
+):
     """
     Retrieves all credits associated with a specific user by their user ID.
 
+    The credits carry their denormalized payment totals (`body_paid`,
+    `percent_paid`, `total_paid`), so no payment aggregation is needed, and their
+    `overdue_days` are computed by the database in the same query.
+
     Args:
-        db (Session): The database session to execute the query.
+        db (AsyncSession): The database session to execute the query.
         user_id (int): The ID of the user whose credits are to be retrieved.
+        load_payments (bool): Whether to also load the `payments` of the credits,
+              fetched for all credits at once with a single `IN` query.
 
     Returns:
-        list: A list of `Credit` objects associated with the specified user.
+        list: A list of `Credit` objects associated with the specified user,
+              ordered by ID.
 
     Raises:
         None: If no credits are found, an empty list is returned.
     """
-    return db.query(Credits).filter(Credits.user_id == user_id).all()
-
-
-def get_total_payment_by_type(db: Session, credit_id: int, type_name: str) -> float:
-    """
-    Retrieves the total payment amount for a specific credit and payment type.
-
-    Args:
-        db (Session): The database session to execute the query.
-        credit_id (int): The ID of the credit for which the total payment is calculated.
-        type_name (str): The name of the payment type (e.g., "body" or "percent").
+    query = _CREDITS_WITH_PAYMENTS_BY_USER if load_payments else _CREDITS_BY_USER
+    result = await db.execute(query, {"user_id": user_id})
+    return result.scalars().all()
 
-    Returns:
-        float: The total sum of payments for the specified credit and payment type.
-              Returns 0 if no payments are found or if the type name is invalid.
 
-    Raises:
-        None: If the payment type name is invalid or no payments are found, 0 is returned.
+def refresh_credit_payment_totals(db: Session) -> None:
     """
-    type_id = db.query(Dictionary.id).filter(Dictionary.name == type_name).first()
-    if not type_id:
-        return 0
-    total = (
-        db.query(func.sum(Payments.sum))
-        .filter(Payments.credit_id == credit_id, Payments.type_id == type_id[0])
-        .scalar()
-    )
-    return total or 0
+    Recomputes the denormalized payment totals of every credit from its payments.
 
-
-def get_total_payments(db: Session, credit_id: int) -> float:
-    """
-    Retrieves the total payment amount for a specific credit.
+    Must be called after payments are inserted, updated or deleted so that the
+    `body_paid`, `percent_paid` and `total_paid` columns of the credits stay in
+    sync with the payments table. Unlike the API queries it runs on a sync
+    session, as payments are written by the CSV import handlers.
 
     Args:
-        db (Session): The database session to execute the query.
-        credit_id (int): The ID of the credit for which the total payment is calculated.
-
-    Returns:
-        float: The total sum of payments for the specified credit.
-              Returns 0 if no payments are found.
-
-    Raises:
-        None: If no payments are found for the given credit, 0 is returned.
+        db (Session): The database session.
     """
-    return (
-        db.query(func.sum(Payments.sum))
-        .filter(Payments.credit_id == credit_id)
-        .scalar()
-        or 0
-    )
 
+    def type_id_of(name: str):
+        return select(Dictionary.id).where(Dictionary.name == name).scalar_subquery()
 
-def calculate_overdue_days(return_date: date) -> int:
-    """
-    Calculates the number of overdue days for a credit based on its return date.
+    def paid(*criteria):
+        return (
+            select(func.coalesce(func.sum(Payments.sum), 0))
+            .where(Payments.credit_id == Credits.id, *criteria)
+            .scalar_subquery()
+        )
 
-    Args:
-        return_date (date): The return date of the credit.
+    db.execute(
+        update(Credits)
+        .values(
+            body_paid=paid(Payments.type_id == type_id_of("body")),
+            percent_paid=paid(Payments.type_id == type_id_of("percent")),
+            total_paid=paid(),
+        )
+        .execution_options(synchronize_session=False)
+    )
 
-    Returns:
-        int: The number of overdue days. Returns 0 if the return date is not overdue.
 
-    Raises:
-        None: If the return date is in the future, returns 0 as there are no overdue days.
+async def get_existing_plan_keys(
+    db: AsyncSession, periods: list[date]
+) -> set[tuple[date, int]]:
     """
-    overdue = (date.today() - return_date).days
-    return max(overdue, 0)
+    Retrieves the (period, category_id) pairs of all plans existing for the given periods.
 
-
-def get_existing_plan(db: Session, period: date, category_id: int) -> Plans | None:
-    """
-    Checks if a plan exists in the database for a specific period and category.
+    The plans are fetched with one range query over the span of the periods rather
+    than an `IN` list, which SQL Server caps at 2100 parameters per statement, and
+    narrowed down to the given periods in Python.
 
     Args:
-        db (Session): The database session.
-        period (date): The period for which the plan is being checked.
-        category_id (int): The ID of the category for which the plan is being checked.
+        db (AsyncSession): The database session.
+        periods (list[date]): The periods for which the existing plans are fetched.
 
     Returns:
-        Plans | None: The existing plan if found, otherwise None.
+        set[tuple[date, int]]: The (period, category_id) pairs of the existing plans.
     """
-    return db.query(Plans).filter_by(period=period, category_id=category_id).first()
+    periods = set(periods)
+    if not periods:
+        return set()
+    result = await db.execute(
+        _EXISTING_PLAN_KEYS,
+        {"first_period": min(periods), "last_period": max(periods)},
+    )
+    return {
+        (period, category_id) for period, category_id in result if period in periods
+    }
 
 
-def create_plan(db: Session, period: date, sum_: int, category_id: int) -> Plans:
+async def create_plans(db: AsyncSession, plans: list[dict]) -> None:
     """
-    Creates a new plan and adds it to the database.
+    Adds multiple new plans to the database in a single bulk insert.
 
-    Args:
-        db (Session): The database session.
-        period (date): The period for the new plan.
-        sum_ (int): The amount of the new plan.
-        category_id (int): The ID of the category for the new plan.
+    The rows are sent as one Core `INSERT` executed with all parameter sets,
+    bypassing the ORM unit of work. SQLAlchemy renders them as multi-row
+    `INSERT ... VALUES` statements batched under SQL Server's 2100 parameter
+    limit, so a chunk takes a few round trips instead of one per row.
 
-    Returns:
-        Plans: The newly created plan.
+    Args:
+        db (AsyncSession): The database session.
+        plans (list[dict]): The plans to insert, each a mapping with the
+              'period', 'sum' and 'category_id' keys.
     """
-    new_plan = Plans(period=period, sum=sum_, category_id=category_id)
-    db.add(new_plan)
-    return new_plan
+    if plans:
+        await db.execute(insert(Plans), plans)
 
 
-def count_issuances_in_month(db: Session, year: int, month: int):
+def in_year(column):
     """
-    Counts the number of credit issuances in a specific month and year.
+    Builds a filter matching the dates of a year in a date column.
+
+    The column is compared against a date range instead of being wrapped in
+    `extract("year", ...)`, so the database can seek the column's index. The
+    range is left as the `year_start` and `year_end` bound parameters, filled
+    in by `year_bounds`, so the statement does not depend on the year.
 
     Args:
-        db (Session): The database session.
-        year (int): The year for which the issuances are being counted.
-        month (int): The month for which the issuances are being counted.
+        column: The date column to filter on.
 
     Returns:
-        int: The number of issuances in the specified month and year.
+        The SQL expression `column >= :year_start AND column < :year_end`.
     """
-    return (
-        db.query(Credits)
-        .filter(
-            extract("year", Credits.issuance_date) == year,
-            extract("month", Credits.issuance_date) == month,
-        )
-        .count()
-    )
+    return and_(column >= bindparam("year_start"), column < bindparam("year_end"))
 
 
-def get_plan_sum_issuance(db: Session, year: int, month: int):
+def year_bounds(year: int) -> dict[str, date]:
     """
-    Retrieves the total sum of the issuance plan for a specific month and year.
+    Builds the bound parameters of the `in_year` filter for a specific year.
 
     Args:
-        db (Session): The database session.
-        year (int): The year for which the plan sum is being calculated.
-        month (int): The month for which the plan sum is being calculated.
+        year (int): The year the dates must fall into.
 
     Returns:
-        float: The total sum of the issuance plan for the specified month and year.
-              Returns 0 if no plan sum is found.
+        dict[str, date]: Jan 1st of the year and Jan 1st of the next year.
     """
-    return (
-        db.query(Plans)
-        .join(Dictionary)
-        .filter(
-            extract("year", Plans.period) == year,
-            extract("month", Plans.period) == month,
-            Dictionary.name == "issuance",
-        )
-        .with_entities(func.sum(Plans.sum))
-        .scalar()
-        or 0
+    return {"year_start": date(year, 1, 1), "year_end": date(year + 1, 1, 1)}
+
+
+_ISSUANCE_MONTH = extract("month", Credits.issuance_date)
+_MONTHLY_ISSUANCES = (
+    select(_ISSUANCE_MONTH, func.count(Credits.id), func.sum(Credits.body))
+    .where(in_year(Credits.issuance_date))
+    .group_by(_ISSUANCE_MONTH)
+)
+_PAYMENT_MONTH = extract("month", Payments.payment_date)
+_MONTHLY_PAYMENTS = (
+    select(_PAYMENT_MONTH, func.count(Payments.id), func.sum(Payments.sum))
+    .join(Credits)
+    .where(in_year(Payments.payment_date))
+    .group_by(_PAYMENT_MONTH)
+)
+_PLAN_MONTH = extract("month", Plans.period)
+_MONTHLY_PLAN_SUMS = (
+    select(_PLAN_MONTH, Plans.category_id, func.sum(Plans.sum))
+    .where(
+        in_year(Plans.period),
+        Plans.category_id.in_(bindparam("category_ids", expanding=True)),
     )
+    .group_by(_PLAN_MONTH, Plans.category_id)
+)
 
 
-def get_issuances_for_month(db: Session, year: int, month: int):
+async def get_monthly_issuances(
+    db: AsyncSession, year: int
+) -> dict[int, tuple[int, int]]:
     """
-    Retrieves the total sum of issuances for a specific month and year.
+    Counts and sums the credit issuances of every month of a specific year.
 
     Args:
-        db (Session): The database session.
-        year (int): The year for which the issuances are being calculated.
-        month (int): The month for which the issuances are being calculated.
+        db (AsyncSession): The database session.
+        year (int): The year for which the issuances are being aggregated.
 
     Returns:
-        float: The total sum of the issuances for the specified month and year.
-              Returns 0 if no issuances are found.
+        dict[int, tuple[int, int]]: A mapping of month number to a tuple of
+              (number of issuances, total issued body). Months without
+              issuances are absent from the mapping.
     """
-    return (
-        db.query(func.sum(Credits.body))
-        .filter(
-            extract("year", Credits.issuance_date) == year,
-            extract("month", Credits.issuance_date) == month,
-        )
-        .scalar()
-        or 0
-    )
+    result = await db.execute(_MONTHLY_ISSUANCES, year_bounds(year))
+    return {int(m): (count, total or 0) for m, count, total in result}
 
 
-def count_payments_in_month(db: Session, year: int, month: int):
+async def get_monthly_payments(
+    db: AsyncSession, year: int
+) -> dict[int, tuple[int, Decimal]]:
     """
-    Counts the number of payments in a specific month and year.
+    Counts and sums the payments of every month of a specific year.
 
     Args:
-        db (Session): The database session.
-        year (int): The year for which the payments are being counted.
-        month (int): The month for which the payments are being counted.
+        db (AsyncSession): The database session.
+        year (int): The year for which the payments are being aggregated.
 
     Returns:
-        int: The number of payments in the specified month and year.
+        dict[int, tuple[int, Decimal]]: A mapping of month number to a tuple of
+              (number of payments, total paid sum). The sums are stored in cents
+              and converted here. Months without payments are absent from the
+              mapping.
     """
-    return (
-        db.query(Payments)
-        .join(Credits)
-        .filter(
-            extract("year", Payments.payment_date) == year,
-            extract("month", Payments.payment_date) == month,
-        )
-        .count()
-    )
+    result = await db.execute(_MONTHLY_PAYMENTS, year_bounds(year))
+    return {int(m): (count, from_cents(total)) for m, count, total in result}
 
 
-def get_plan_sum_for_payments(db: Session, year: int, month: int):
+async def get_monthly_plan_sums(
+    db: AsyncSession,
+    year: int,
+    categories: tuple[str, ...] = ("issuance", "collection"),
+) -> dict[tuple[int, str], int]:
     """
-    Retrieves the total sum of the payment plan for a specific month and year.
+    Sums the plans of every month and category of a specific year.
 
     Args:
-        db (Session): The database session.
-        year (int): The year for which the payment plan sum is being calculated.
-        month (int): The month for which the payment plan sum is being calculated.
+        db (AsyncSession): The database session.
+        year (int): The year for which the plans are being aggregated.
+        categories (tuple[str, ...]): The names of the plan categories to sum.
 
     Returns:
-        int: The total sum of the payment plan for the specified month and year.
-              Returns 0 if no plan sum is found.
+        dict[tuple[int, str], int]: A mapping of (month number, category name),
+              e.g. (1, "issuance") or (1, "collection"), to the planned sum.
+              Months without plans are absent from the mapping.
     """
-    return (
-        db.query(Plans)
-        .join(Dictionary)
-        .filter(
-            extract("year", Plans.period) == year,
-            extract("month", Plans.period) == month,
-            Dictionary.name == "collection",
-        )
-        .with_entities(func.sum(Plans.sum))
-        .scalar()
-        or 0
+    names_by_id = {await type_id(db, name): name for name in categories}
+    names_by_id.pop(None, None)
+    if not names_by_id:
+        return {}
+    result = await db.execute(
+        _MONTHLY_PLAN_SUMS,
+        {**year_bounds(year), "category_ids": list(names_by_id)},
     )
-
-
-def get_sum_payments_for_month(db: Session, year: int, month: int):
+    return {
+        (int(m), names_by_id[category_id]): total or 0
+        for m, category_id, total in result
+    }
+
+
+async def get_year_performance_aggregates(
+    db: AsyncSession,
+    year: int,
+    categories: tuple[str, ...] = ("issuance", "collection"),
+) -> tuple[
+    dict[int, tuple[int, int]],
+    dict[int, tuple[int, Decimal]],
+    dict[tuple[int, str], int],
+]:
     """
-    Retrieves the total sum of payments for a specific month and year.
+    Aggregates the issuances, payments and plans of every month of a specific year.
+
+    On SQL Server the three aggregates come from a single call of the
+    `sp_year_performance` stored procedure. Other databases, which do not
+    have the procedure, run `get_monthly_issuances`, `get_monthly_payments`
+    and `get_monthly_plan_sums` instead.
 
     Args:
-        db (Session): The database session.
-        year (int): The year for which the payments are being calculated.
-        month (int): The month for which the payments are being calculated.
+        db (AsyncSession): The database session.
+        year (int): The year for which the aggregates are computed.
+        categories (tuple[str, ...]): The names of the plan categories to sum.
 
     Returns:
-        float: The total sum of payments for the specified month and year.
-              Returns 0 if no payments are found.
+        tuple: The monthly issuances, payments and plan sums, shaped as the
+              results of `get_monthly_issuances`, `get_monthly_payments` and
+              `get_monthly_plan_sums` respectively.
     """
-    return (
-        db.query(func.sum(Payments.sum))
-        .join(Credits)
-        .filter(
-            extract("year", Payments.payment_date) == year,
-            extract("month", Payments.payment_date) == month,
+    if db.bind.dialect.name != "mssql":
+        return (
+            await get_monthly_issuances(db, year),
+            await get_monthly_payments(db, year),
+            await get_monthly_plan_sums(db, year, categories),
         )
-        .scalar()
-        or 0
-    )
+    names_by_id = {await type_id(db, name): name for name in categories}
+    names_by_id.pop(None, None)
+    issuances, payments, plan_sums = {}, {}, {}
+    result = await db.execute(CALL_YEAR_PERFORMANCE, {"year": year})
+    for kind, month, category_id, count, total in result:
+        if kind == "issuance":
+            issuances[month] = (count, int(total or 0))
+        elif kind == "payment":
+            payments[month] = (count, from_cents(total))
+        elif category_id in names_by_id:
+            plan_sums[(month, names_by_id[category_id])] = int(total or 0)
+    return issuances, payments, plan_sums
@@ -0,0 +1,89 @@
+from sqlalchemy import DDL, event, text
+from core.database import Base
+
+# Indexed views keeping the monthly issuance and payment aggregates up to date,
+# so reports read a dozen precomputed rows instead of scanning the tables.
+# They are only created when missing, as altering a view drops its index.
+# Indexed views only allow SUM over non-nullable expressions, hence ISNULL.
+MONTHLY_CREDIT_STATS_VIEW = DDL("""
+IF OBJECT_ID('dbo.vw_monthly_credit_stats', 'V') IS NULL
+EXEC('
+CREATE VIEW dbo.vw_monthly_credit_stats WITH SCHEMABINDING
+AS
+SELECT YEAR(issuance_date) AS y,
+       MONTH(issuance_date) AS m,
+       COUNT_BIG(*) AS cnt,
+       SUM(CAST(ISNULL(body, 0) AS BIGINT)) AS body_sum
+FROM dbo.credits
+GROUP BY YEAR(issuance_date), MONTH(issuance_date)
+');
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'ix_vw_monthly_credit_stats'
+      AND object_id = OBJECT_ID('dbo.vw_monthly_credit_stats')
+)
+CREATE UNIQUE CLUSTERED INDEX ix_vw_monthly_credit_stats
+    ON dbo.vw_monthly_credit_stats (y, m);
+""")
+
+MONTHLY_PAYMENT_STATS_VIEW = DDL("""
+IF OBJECT_ID('dbo.vw_monthly_payment_stats', 'V') IS NULL
+EXEC('
+CREATE VIEW dbo.vw_monthly_payment_stats WITH SCHEMABINDING
+AS
+SELECT YEAR(p.payment_date) AS y,
+       MONTH(p.payment_date) AS m,
+       COUNT_BIG(*) AS cnt,
+       SUM(ISNULL(p.[sum], 0)) AS payment_sum
+FROM dbo.payments AS p
+JOIN dbo.credits AS c ON c.id = p.credit_id
+GROUP BY YEAR(p.payment_date), MONTH(p.payment_date)
+');
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'ix_vw_monthly_payment_stats'
+      AND object_id = OBJECT_ID('dbo.vw_monthly_payment_stats')
+)
+CREATE UNIQUE CLUSTERED INDEX ix_vw_monthly_payment_stats
+    ON dbo.vw_monthly_payment_stats (y, m);
+""")
+
+# Aggregates the issuances, payments and plans of every month of a year in one
+# round trip. The three aggregates are returned as a single result set, told
+# apart by the `kind` column, so the call needs no `nextset()` on the cursor.
+# NOEXPAND makes SQL Server read the indexed views instead of their tables.
+YEAR_PERFORMANCE_PROCEDURE = DDL("""
+CREATE OR ALTER PROCEDURE dbo.sp_year_performance @year INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @year_start DATE = DATEFROMPARTS(@year, 1, 1);
+    DECLARE @year_end DATE = DATEFROMPARTS(@year + 1, 1, 1);
+
+    SELECT 'issuance' AS kind,
+           cs.m AS month,
+           CAST(NULL AS INT) AS category_id,
+           cs.cnt AS count,
+           CAST(cs.body_sum AS DECIMAL(18, 2)) AS total
+    FROM dbo.vw_monthly_credit_stats AS cs WITH (NOEXPAND)
+    WHERE cs.y = @year
+    UNION ALL
+    SELECT 'payment', ps.m, NULL, ps.cnt, ps.payment_sum
+    FROM dbo.vw_monthly_payment_stats AS ps WITH (NOEXPAND)
+    WHERE ps.y = @year
+    UNION ALL
+    SELECT 'plan', MONTH(pl.period), pl.category_id, COUNT_BIG(*), SUM(pl.[sum])
+    FROM dbo.plans AS pl
+    WHERE pl.period >= @year_start AND pl.period < @year_end
+    GROUP BY MONTH(pl.period), pl.category_id;
+END
+""")
+
+CALL_YEAR_PERFORMANCE = text("EXEC dbo.sp_year_performance @year = :year")
+
+for ddl in (
+    MONTHLY_CREDIT_STATS_VIEW,
+    MONTHLY_PAYMENT_STATS_VIEW,
+    YEAR_PERFORMANCE_PROCEDURE,
+):
+    event.listen(Base.metadata, "after_create", ddl.execute_if(dialect="mssql"))
@@ -1,23 +1,22 @@
-import pandas as pd
-from sqlalchemy import create_engine
-from core.database import SQLALCHEMY_DATABASE_URL
+from sqlalchemy import Connection
+from handlers.loader import invalidate_api_caches, load_csv
 
-df = pd.read_csv(
-    "handlers/db_data/credits.csv",
-    sep="\t",
-    parse_dates=["issuance_date", "return_date", "actual_return_date"],
-    dayfirst=True,
-    na_values=[""],
-)
 
+def load(con: Connection | None = None) -> None:
+    """
+    Loads the credits from `handlers/db_data/credits.csv` into the database.
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    Args:
+        con (Connection | None): The connection to insert the rows with.
+    """
+    load_csv(
+        "credits",
+        "handlers/db_data/credits.csv",
+        ["issuance_date", "return_date", "actual_return_date"],
+        con=con,
+    )
 
-if "id" in df.columns:
-    df = df.drop(columns=["id"])
 
-date_columns = ["issuance_date", "return_date", "actual_return_date"]
-for col in date_columns:
-    df[col] = pd.to_datetime(df[col], dayfirst=True, errors="coerce").dt.date
-
-df.to_sql("credits", con=engine, if_exists="append", index=False)
+if __name__ == "__main__":
+    load()
+    invalidate_api_caches()
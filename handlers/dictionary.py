@@ -1,12 +1,16 @@
-import pandas as pd
-from sqlalchemy import create_engine
-from core.database import SQLALCHEMY_DATABASE_URL
+from sqlalchemy import Connection
+from handlers.loader import load_csv
 
-df = pd.read_csv("handlers/db_data/dictionary.csv", sep="\t")
 
-if "id" in df.columns:
-    df = df.drop(columns=["id"])
+def load(con: Connection | None = None) -> None:
+    """
+    Loads the dictionary from `handlers/db_data/dictionary.csv` into the database.
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    Args:
+        con (Connection | None): The connection to insert the rows with.
+    """
+    load_csv("dictionary", "handlers/db_data/dictionary.csv", con=con)
 
-df.to_sql("dictionary", con=engine, index=False, if_exists="append")
+
+if __name__ == "__main__":
+    load()
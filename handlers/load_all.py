@@ -0,0 +1,24 @@
+from core.database import engine
+from handlers import credits, dictionary, payments, plans, users
+from handlers.loader import invalidate_api_caches
+
+# Referenced tables are loaded before the tables referencing them.
+LOADERS = (dictionary, users, credits, plans, payments)
+
+
+def load() -> None:
+    """
+    Loads all CSV files of `handlers/db_data` into the database.
+
+    All files are loaded over a single connection in one transaction, committed
+    once at the end, so a failing file leaves the database untouched. The cached
+    API responses are dropped after the commit.
+    """
+    with engine.begin() as con:
+        for loader in LOADERS:
+            loader.load(con)
+    invalidate_api_caches()
+
+
+if __name__ == "__main__":
+    load()
@@ -0,0 +1,77 @@
+import asyncio
+import pandas as pd
+from sqlalchemy import Connection
+from core.cache import USER_CREDITS_PREFIX, YEAR_PERFORMANCE_PREFIX, invalidate_prefix
+from core.database import engine
+from core.money import CENTS_PER_UNIT
+
+# SQL Server accepts at most 2100 parameters per statement, which bounds the
+# number of rows a multi-row INSERT can carry.
+MSSQL_MAX_PARAMETERS = 2100
+
+DATE_FORMAT = "%d.%m.%Y"
+
+
+def load_csv(
+    table: str,
+    path: str,
+    date_columns: list[str] | None = None,
+    con: Connection | None = None,
+    money_columns: list[str] | None = None,
+) -> None:
+    """
+    Loads a tab-separated CSV file into a database table.
+
+    The 'id' column is dropped so the database assigns identities, and the given
+    date columns are parsed by the CSV reader itself using the fixed `DATE_FORMAT`.
+    Money columns hold decimal amounts in the file and are stored as integer cents.
+    Rows are inserted in batches: with `fast_executemany` pyodbc sends each batch's
+    parameter arrays in a single round trip, otherwise multi-row INSERT statements
+    are used.
+
+    Args:
+        table (str): The name of the table to insert the rows into.
+        path (str): The path to the CSV file.
+        date_columns (list[str] | None): The columns to parse as dates.
+        con (Connection | None): The connection to insert the rows with, letting
+              several files be loaded in one transaction. Defaults to a
+              connection of the shared engine, committed once the file is loaded.
+        money_columns (list[str] | None): The columns to convert to cents.
+    """
+    df = pd.read_csv(
+        path,
+        sep="\t",
+        na_values=[""],
+        parse_dates=date_columns or False,
+        date_format=DATE_FORMAT,
+    )
+
+    if "id" in df.columns:
+        df = df.drop(columns=["id"])
+
+    for column in money_columns or []:
+        df[column] = (df[column] * CENTS_PER_UNIT).round().astype("Int64")
+
+    if con is None:
+        con = engine
+    if getattr(con.dialect, "fast_executemany", False):
+        df.to_sql(table, con=con, if_exists="append", index=False, chunksize=1000)
+    else:
+        df.to_sql(
+            table,
+            con=con,
+            if_exists="append",
+            index=False,
+            chunksize=min(500, MSSQL_MAX_PARAMETERS // len(df.columns) - 1),
+            method="multi",
+        )
+
+
+def invalidate_api_caches() -> None:
+    """
+    Drops the cached API responses, which are derived from the loaded tables.
+
+    Must be called once the loaded rows are committed, so that the endpoints do
+    not keep serving cached data from before the import.
+    """
+    asyncio.run(invalidate_prefix(USER_CREDITS_PREFIX, YEAR_PERFORMANCE_PREFIX))
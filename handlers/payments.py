@@ -1,13 +1,33 @@
-import pandas as pd
-from sqlalchemy import create_engine
-from core.database import SQLALCHEMY_DATABASE_URL
+from sqlalchemy import Connection
+from sqlalchemy.orm import Session
+from core.database import SessionLocal
+from db_operations.crud import refresh_credit_payment_totals
+from handlers.loader import invalidate_api_caches, load_csv
 
-df = pd.read_csv("handlers/db_data/payments.csv", sep="\t")
 
+def load(con: Connection | None = None) -> None:
+    """
+    Loads the payments from `handlers/db_data/payments.csv` into the database.
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    The denormalized payment totals of the credits are refreshed afterwards.
 
-if "id" in df.columns:
-    df = df.drop(columns=["id"])
-df["payment_date"] = pd.to_datetime(df["payment_date"], dayfirst=True)
-df.to_sql("payments", con=engine, if_exists="append", index=False)
+    Args:
+        con (Connection | None): The connection to insert the rows with. The
+              totals are then refreshed in its transaction too.
+    """
+    load_csv(
+        "payments",
+        "handlers/db_data/payments.csv",
+        ["payment_date"],
+        con=con,
+        money_columns=["sum"],
+    )
+
+    with SessionLocal() if con is None else Session(bind=con) as db:
+        refresh_credit_payment_totals(db)
+        db.commit()
+
+
+if __name__ == "__main__":
+    load()
+    invalidate_api_caches()
@@ -1,13 +1,17 @@
-import pandas as pd
-from sqlalchemy import create_engine
-from core.database import SQLALCHEMY_DATABASE_URL
+from sqlalchemy import Connection
+from handlers.loader import invalidate_api_caches, load_csv
 
-df = pd.read_csv("handlers/db_data/plans.csv", sep="\t")
 
+def load(con: Connection | None = None) -> None:
+    """
+    Loads the plans from `handlers/db_data/plans.csv` into the database.
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    Args:
+        con (Connection | None): The connection to insert the rows with.
+    """
+    load_csv("plans", "handlers/db_data/plans.csv", ["period"], con=con)
 
-if "id" in df.columns:
-    df = df.drop(columns=["id"])
-df["period"] = pd.to_datetime(df["period"], dayfirst=True)
-df.to_sql("plans", con=engine, if_exists="append", index=False)
+
+if __name__ == "__main__":
+    load()
+    invalidate_api_caches()
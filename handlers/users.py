@@ -1,13 +1,16 @@
-import pandas as pd
-from sqlalchemy import create_engine
-from core.database import SQLALCHEMY_DATABASE_URL
+from sqlalchemy import Connection
+from handlers.loader import load_csv
 
-df = pd.read_csv("handlers/db_data/users.csv", sep="\t")
 
+def load(con: Connection | None = None) -> None:
+    """
+    Loads the users from `handlers/db_data/users.csv` into the database.
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    Args:
+        con (Connection | None): The connection to insert the rows with.
+    """
+    load_csv("users", "handlers/db_data/users.csv", ["registration_date"], con=con)
 
-if "id" in df.columns:
-    df = df.drop(columns=["id"])
-df["registration_date"] = pd.to_datetime(df["registration_date"], dayfirst=True)
-df.to_sql("users", con=engine, if_exists="append", index=False)
+
+if __name__ == "__main__":
+    load()
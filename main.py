@@ -3,48 +3,157 @@ from models.credits import Credits
 from models.payments import Payments
 from models.dictionary import Dictionary
 from models.plans import Plans
-from core.database import SessionLocal, engine
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from core.database import AsyncSessionLocal, engine
+from fastapi import FastAPI, Depends, Header, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from core.config import settings
 from core.database import Base
+from core.cache import (
+    get_cached,
+    YEAR_PERFORMANCE_PREFIX,
+    invalidate,
+    invalidate_prefix,
+    set_cached,
+    user_credits_key,
+    year_performance_key,
+)
+from core.dictionary_cache import load_dictionary, type_id
+from core.money import from_cents
 from fastapi import UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+import openpyxl
 import pandas as pd
-import io
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import AsyncIterator, Iterator
 from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from schemas.credits import ClosedCredit, OpenCredit
+from schemas.performance import MonthPerformance, YearPerformance
 from db_operations.crud import (
     get_credits_by_user_id,
-    get_total_payments,
-    get_total_payment_by_type,
-    calculate_overdue_days,
-    get_existing_plan,
-    create_plan,
-    count_issuances_in_month,
-    get_plan_sum_issuance,
-    get_issuances_for_month,
-    count_payments_in_month,
-    get_plan_sum_for_payments,
-    get_sum_payments_for_month,
+    get_existing_plan_keys,
+    create_plans,
+    get_year_performance_aggregates,
 )
 
-Base.metadata.create_all(bind=engine)
+# Creating the schema at startup probes every table, so it is left to local
+# setups; deployed databases are expected to be provisioned beforehand.
+if settings.AUTO_CREATE_TABLES:
+    Base.metadata.create_all(bind=engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Warms the in-memory dictionary cache before the first request is served.
+    """
+    async with AsyncSessionLocal() as db:
+        await load_dictionary(db)
+    yield
+
+
+# Responses are serialized with orjson, which is considerably faster than the
+# standard library encoder used by the default JSONResponse.
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+PLANS_CHUNK_SIZE = 10_000
+
+PLAN_COLUMNS = {"period", "sum", "category_id"}
+
+PLANS_UNIQUE_CONSTRAINT = "uq_plans_period_category"
 
-app = FastAPI()
+# The format of the plan periods; files in any other format are parsed by
+# inference, which is much slower.
+PERIOD_FORMAT = "%d.%m.%Y"
 
+PERCENT_QUANTUM = Decimal("0.01")
 
-def get_db():
+# Past years' performance only changes when plans, credits or payments are
+# (re)imported, so it is cached for a day; the current year for a minute.
+PAST_YEAR_PERFORMANCE_TTL = 86_400
+CURRENT_YEAR_PERFORMANCE_TTL = 60
+
+# Credits change with every payment import, so users' credits are cached briefly.
+USER_CREDITS_TTL = 30
+
+# The dictionary names of the issuance and collection plan categories.
+PLAN_CATEGORIES = ("issuance", "collection")
+
+
+def percent(part: pd.Series, whole) -> pd.Series:
     """
-    Dependency that provides a database session and ensures it is closed after use.
+    Formats `part / whole` as percentages with two decimals, e.g. "45.50%".
+
+    The ratios are computed with `Decimal` and quantized, so money values are never
+    converted to float. `whole` may be a Series aligned with `part` or a single
+    number; where it is 0 the percentage is reported as "0.00%".
     """
-    db = SessionLocal()
-    try:
+    part = part.astype(object)
+    whole = pd.Series(whole, index=part.index).astype(object)
+    nonzero = whole != 0
+    ratios = part[nonzero].map(Decimal) / whole[nonzero].map(Decimal) * 100
+    return ratios.map(
+        lambda ratio: f"{ratio.quantize(PERCENT_QUANTUM, ROUND_HALF_UP)}%"
+    ).reindex(part.index, fill_value=f"{Decimal(0).quantize(PERCENT_QUANTUM)}%")
+
+
+def etag(*values) -> str:
+    """
+    Builds a strong ETag from the SHA-1 of the JSON encoding of the given values.
+    """
+    encoded = json.dumps(jsonable_encoder(values), separators=(",", ":"))
+    return f'"{hashlib.sha1(encoded.encode()).hexdigest()}"'
+
+
+def is_not_modified(if_none_match: str | None, tag: str) -> bool:
+    """
+    Checks whether an `If-None-Match` request header matches an ETag.
+    """
+    if if_none_match is None:
+        return False
+    tags = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in tags or tag in tags
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency that provides an async database session and ensures it is closed after use.
+
+    Sessions are backed by the async engine's connection pool, so closing a session
+    returns its connection to the pool instead of disconnecting.
+    """
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@app.get("/user_credits/{user_id}")
-def get_user_credits(user_id: int, db: Session = Depends(get_db)):
+@app.post("/reload_dictionary")
+async def reload_dictionary(db: AsyncSession = Depends(get_db)):
+    """
+    Reloads the in-memory dictionary cache after the dictionary table was changed.
+
+    Only the worker process serving the request is reloaded; the other workers of
+    a multi-process deployment pick the change up within `DICTIONARY_TTL` seconds.
+    The cached year performance, which depends on the plan categories, is dropped.
+    """
+    count = await load_dictionary(db)
+    await invalidate_prefix(YEAR_PERFORMANCE_PREFIX)
+    return ORJSONResponse(content={"message": f"Loaded {count} dictionary entries."})
+
+
+@app.get("/user_credits/{user_id}", response_model=list[ClosedCredit | OpenCredit])
+async def get_user_credits(
+    user_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Returns a list of credit details for a given user.
 
@@ -55,126 +164,313 @@ def get_user_credits(user_id: int, db: Session = Depends(get_db)):
     - for open credits: planned return date, overdue days, body, percent,
       payments by body and percent
 
+    Money values are returned as decimal strings to avoid float rounding.
+
+    Results are cached per user for `USER_CREDITS_TTL` seconds and dropped when
+    credits or payments are imported. The response carries an ETag hashed from the
+    payload; a request whose `If-None-Match` matches it gets a 304.
+
     Raises:
         HTTPException: If no credits are found for the user.
     """
-    credits = get_credits_by_user_id(db, user_id)
-
-    if not credits:
-        raise HTTPException(status_code=404, detail="User or credits not found")
-
-    result = []
-    for credit in credits:
-        is_closed = credit.actual_return_date is not None
-        credit_data = {"issuance_date": credit.issuance_date, "is_closed": is_closed}
-
-        if is_closed:
-            credit_data.update(
-                {
-                    "actual_return_date": credit.actual_return_date,
-                    "body": credit.body,
-                    "percent": credit.percent,
-                    "total_payments": get_total_payments(db, credit.id),
-                }
-            )
-        else:
-            credit_data.update(
-                {
-                    "return_date": credit.return_date,
-                    "overdue_days": calculate_overdue_days(credit.return_date),
-                    "body": credit.body,
-                    "percent": credit.percent,
-                    "body_payments": get_total_payment_by_type(db, credit.id, "body"),
-                    "percent_payments": get_total_payment_by_type(
-                        db, credit.id, "percent"
-                    ),
-                }
+    cache_key = user_credits_key(user_id)
+    result = await get_cached(cache_key)
+    if result is None:
+        credits = await get_credits_by_user_id(db, user_id)
+        if not credits:
+            raise HTTPException(status_code=404, detail="User or credits not found")
+        result = [
+            (
+                ClosedCredit(
+                    issuance_date=credit.issuance_date,
+                    is_closed=True,
+                    actual_return_date=credit.actual_return_date,
+                    body=credit.body,
+                    percent=credit.percent,
+                    total_payments=from_cents(credit.total_paid),
+                )
+                if credit.actual_return_date is not None
+                else OpenCredit(
+                    issuance_date=credit.issuance_date,
+                    is_closed=False,
+                    return_date=credit.return_date,
+                    overdue_days=credit.overdue_days,
+                    body=credit.body,
+                    percent=credit.percent,
+                    body_payments=from_cents(credit.body_paid),
+                    percent_payments=from_cents(credit.percent_paid),
+                )
             )
+            for credit in credits
+        ]
+        await set_cached(cache_key, result, USER_CREDITS_TTL)
+
+    headers = {"ETag": etag(result), "Cache-Control": "private, no-cache"}
+    if is_not_modified(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return result
 
-        result.append(credit_data)
 
-    return result
+def first_row(mask: pd.Series) -> int:
+    """
+    Returns the 1-based row number of the first True value of a boolean mask.
+    """
+    return int(mask.idxmax()) + 1
 
 
-@app.post("/plans_insert")
-def plans_insert(file: UploadFile = File(...), db: Session = Depends(get_db)):
+def without_trailing_blank_rows(rows: Iterator[tuple]) -> Iterator[tuple]:
     """
-    Uploads a monthly plans file and inserts valid entries into the database.
+    Yields the rows of a sheet up to its last non-blank one.
 
-    The file must be in Excel (.xlsx/.xls) or tab-separated CSV format, and contain
-    the columns: 'period', 'sum', and 'category_id'.
+    Blank rows are held back until a non-blank row follows them, so interior blank
+    rows are kept, as empty tuples, while the trailing ones are dropped.
+    """
+    blank_rows = 0
+    for row in rows:
+        if all(value is None for value in row):
+            blank_rows += 1
+            continue
+        for _ in range(blank_rows):
+            yield ()
+        blank_rows = 0
+        yield row
+
+
+def read_xlsx_chunks(file, usecols) -> Iterator[pd.DataFrame]:
+    """
+    Streams the active sheet of an .xlsx workbook in chunks of `PLANS_CHUNK_SIZE` rows.
 
-    Validations:
-    - 'period' must be the first day of the month.
-    - 'sum' must not be empty (0 is allowed).
-    - A plan with the same 'period' and 'category_id' must not already exist.
+    The workbook is opened in openpyxl's read-only mode, which parses rows lazily
+    instead of building the whole sheet, so memory use is bounded by the chunk size.
+    As with `pd.read_excel`, the first row holds the column names, trailing blank
+    rows are dropped and interior ones are kept as all-None rows, so validation
+    reports them under their own row numbers.
+    """
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = without_trailing_blank_rows(workbook.active.iter_rows(values_only=True))
+        header = next(rows, ())
+        positions = [i for i, name in enumerate(header) if usecols(name)]
+        columns = [header[i] for i in positions]
+        start = 0
+        while True:
+            batch = [
+                [row[i] if i < len(row) else None for i in positions]
+                for row in islice(rows, PLANS_CHUNK_SIZE)
+            ]
+            yield pd.DataFrame(
+                batch, columns=columns, index=pd.RangeIndex(start, start + len(batch))
+            )
+            if len(batch) < PLANS_CHUNK_SIZE:
+                return
+            start += len(batch)
+    finally:
+        workbook.close()
+
+
+def read_plans_file(file: UploadFile) -> Iterator[pd.DataFrame]:
+    """
+    Reads an uploaded plans file and yields it in chunks with normalized column names.
+
+    Tab-separated UTF-8 CSV files are decoded by the C parser straight from the
+    spooled upload, without copying it into memory, in chunks of
+    `PLANS_CHUNK_SIZE` rows, so the file is never held in memory as a whole; .xlsx
+    workbooks are streamed by `read_xlsx_chunks` the same way. Columns other than
+    `PLAN_COLUMNS` are skipped while parsing.
 
     Raises:
-        HTTPException: On invalid file format, missing/invalid fields, or duplicates.
+        HTTPException: If the file cannot be parsed as Excel or tab-separated CSV.
     """
+
+    def is_plan_column(name) -> bool:
+        return str(name).strip().lower() in PLAN_COLUMNS
+
     try:
-        if file.filename.endswith(".xlsx") or file.filename.endswith(".xls"):
-            df = pd.read_excel(file.file)
+        file.file.seek(0)
+        if file.filename.endswith(".xlsx"):
+            chunks = read_xlsx_chunks(file.file, is_plan_column)
+        elif file.filename.endswith(".xls"):
+            chunks = [pd.read_excel(file.file, usecols=is_plan_column)]
         else:
-            contents = file.file.read()
-            df = pd.read_csv(io.StringIO(contents.decode("utf-8")), sep="\t")
+            chunks = pd.read_csv(
+                file.file,
+                sep="\t",
+                encoding="utf-8",
+                engine="c",
+                usecols=is_plan_column,
+                chunksize=PLANS_CHUNK_SIZE,
+            )
+        for chunk in chunks:
+            chunk.columns = chunk.columns.str.strip().str.lower()
+            yield chunk
     except Exception:
         raise HTTPException(
             status_code=400,
             detail="Invalid file format. Please upload an Excel or tab-separated CSV file.",
         )
 
-    df.columns = df.columns.str.strip().str.lower()
 
-    required_columns = {"period", "sum", "category_id"}
-    if not required_columns.issubset(df.columns):
+async def validate_plans(db: AsyncSession, chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validates a chunk of an uploaded plans file and converts it to plan records.
+
+    Returns:
+        pd.DataFrame: The 'period', 'sum' and 'category_id' columns ready for insertion.
+
+    Raises:
+        HTTPException: On missing/invalid fields or duplicates, naming the first
+            offending row.
+    """
+    if not PLAN_COLUMNS.issubset(chunk.columns):
         raise HTTPException(
             status_code=400,
-            detail=f"The file must contain the following columns: {required_columns}",
+            detail=f"The file must contain the following columns: {PLAN_COLUMNS}",
         )
 
-    for index, row in df.iterrows():
-        try:
-            period = pd.to_datetime(row["period"], dayfirst=True).date()
-        except Exception:
-            raise HTTPException(
-                status_code=400, detail=f"Invalid date format in row {index + 1}"
+    periods = pd.to_datetime(
+        chunk["period"], format=PERIOD_FORMAT, errors="coerce", cache=True
+    )
+    # Only the periods not in `PERIOD_FORMAT` are parsed by inference, one by one,
+    # as the format inferred for a whole column would reject the other formats.
+    unparsed = periods.isna()
+    if unparsed.any():
+        periods = periods.fillna(
+            pd.to_datetime(
+                chunk["period"][unparsed].map(
+                    lambda value: pd.to_datetime(value, dayfirst=True, errors="coerce")
+                )
             )
+        )
+    invalid_periods = periods.isna()
+    if invalid_periods.any():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid date format in row {first_row(invalid_periods)}",
+        )
 
-        if period.day != 1:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Date in row {index + 1} must be the first day of the month",
-            )
+    not_first_day = periods.dt.day != 1
+    if not_first_day.any():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date in row {first_row(not_first_day)} must be the first day of the month",
+        )
 
-        if pd.isnull(row["sum"]):
-            raise HTTPException(
-                status_code=400, detail=f"The 'sum' field in row {index + 1} is empty"
-            )
+    empty_sums = chunk["sum"].isna()
+    if empty_sums.any():
+        raise HTTPException(
+            status_code=400,
+            detail=f"The 'sum' field in row {first_row(empty_sums)} is empty",
+        )
 
-        try:
-            category_id = int(row["category_id"])
-        except ValueError:
-            raise HTTPException(
-                status_code=400, detail=f"Invalid category_id in row {index + 1}"
-            )
+    sums = pd.to_numeric(chunk["sum"], errors="coerce")
+    invalid_sums = sums.isna()
+    if invalid_sums.any():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sum in row {first_row(invalid_sums)}",
+        )
 
-        if get_existing_plan(db, period, category_id):
-            raise HTTPException(
-                status_code=400,
-                detail=f"A plan for period {period} and category {category_id} already exists (row {index + 1})",
-            )
+    category_ids = pd.to_numeric(chunk["category_id"], errors="coerce")
+    invalid_category_ids = category_ids.isna()
+    if invalid_category_ids.any():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid category_id in row {first_row(invalid_category_ids)}",
+        )
+
+    plans = pd.DataFrame(
+        {
+            "period": periods.dt.date,
+            "sum": sums.astype(int),
+            "category_id": category_ids.astype(int),
+        }
+    )
+
+    repeated = plans.duplicated(["period", "category_id"])
+    if repeated.any():
+        index = repeated.idxmax()
+        raise HTTPException(
+            status_code=400,
+            detail=f"A plan for period {plans.at[index, 'period']} and category {plans.at[index, 'category_id']} is repeated in the file (row {index + 1})",
+        )
+
+    existing = await get_existing_plan_keys(db, plans["period"].unique().tolist())
+    duplicates = pd.Series(
+        pd.MultiIndex.from_frame(plans[["period", "category_id"]]).isin(existing),
+        index=plans.index,
+    )
+    if duplicates.any():
+        index = duplicates.idxmax()
+        raise HTTPException(
+            status_code=400,
+            detail=f"A plan for period {plans.at[index, 'period']} and category {plans.at[index, 'category_id']} already exists (row {index + 1})",
+        )
 
-        create_plan(db, period, int(row["sum"]), category_id)
+    return plans
 
-    db.commit()
-    return JSONResponse(
+
+@app.post("/plans_insert")
+async def plans_insert(
+    file: UploadFile = File(...), db: AsyncSession = Depends(get_db)
+):
+    """
+    Uploads a monthly plans file and inserts valid entries into the database.
+
+    The file must be in Excel (.xlsx/.xls) or tab-separated CSV format, and contain
+    the columns: 'period', 'sum', and 'category_id'.
+
+    Validations:
+    - 'period' must be the first day of the month.
+    - 'sum' must not be empty (0 is allowed).
+    - A plan with the same 'period' and 'category_id' must not already exist
+      or be repeated in the file.
+
+    The file is validated and bulk inserted chunk by chunk within one transaction,
+    so nothing is inserted if any row is invalid. Chunks are parsed in the
+    threadpool to keep the event loop free, the next one while the current one
+    is validated and inserted.
+
+    Raises:
+        HTTPException: On invalid file format, missing/invalid fields, or duplicates.
+    """
+    chunks = read_plans_file(file)
+    next_chunk = asyncio.ensure_future(run_in_threadpool(next, chunks, None))
+    years = set()
+    try:
+        while (chunk := await next_chunk) is not None:
+            next_chunk = asyncio.ensure_future(run_in_threadpool(next, chunks, None))
+            plans = await validate_plans(db, chunk)
+            await create_plans(db, plans.to_dict("records"))
+            years.update(period.year for period in plans["period"])
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        # The unique constraint is only hit by concurrent uploads, as duplicates are
+        # checked beforehand; anything else is the foreign key to the dictionary.
+        if PLANS_UNIQUE_CONSTRAINT in str(exc.orig):
+            detail = "A plan for one of the periods and categories in the file already exists"
+        else:
+            detail = "One of the category_ids in the file does not exist"
+        raise HTTPException(status_code=400, detail=detail)
+    finally:
+        # A chunk may still be parsing when validation fails; let it finish
+        # before the upload is closed.
+        await asyncio.gather(next_chunk, return_exceptions=True)
+
+    await invalidate(*(year_performance_key(year) for year in years))
+    return ORJSONResponse(
         content={"message": "Plans were successfully inserted into the database."}
     )
 
 
-@app.get("/year_performance")
-def year_performance(year: int, db: Session = Depends(get_db)):
+@app.get("/year_performance", response_model=list[MonthPerformance | YearPerformance])
+async def year_performance(
+    year: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Retrieves a year’s performance data, including monthly and total issuance and payment performance.
 
@@ -183,6 +479,13 @@ def year_performance(year: int, db: Session = Depends(get_db)):
     - Total data: Aggregated performance for the year (total issuances, payments, and performance percentages).
 
     The performance is calculated as the ratio of actual values to planned values, presented as a percentage.
+    Money sums are returned as decimal strings and percentages with two decimals.
+
+    Results are cached per year, briefly for the current year and for a day for
+    past years; uploading plans invalidates the affected years. Clients may cache
+    them for as long, and get a 304 when their `If-None-Match` matches the ETag.
+    While a plan category is missing from the dictionary, e.g. before the data is
+    imported, results are not cached at all.
     """
     current_date = date.today()
     current_year = current_date.year
@@ -192,75 +495,111 @@ def year_performance(year: int, db: Session = Depends(get_db)):
             detail=f"Invalid year: {year}. Must be between 2000 and {current_year + 1}.",
         )
 
-    results = []
-    for month in range(1, 13):
-        issuances = count_issuances_in_month(db, year, month)
-        plan_sum_issuances = get_plan_sum_issuance(db, year, month)
-        sum_issuances_for_month = get_issuances_for_month(db, year, month)
-        issuance_plan_percent = round(
-            (
-                (sum_issuances_for_month / plan_sum_issuances * 100)
-                if plan_sum_issuances
-                else 0
-            ),
-            2,
-        )
-        payments_in_month = count_payments_in_month(db, year, month)
-        plan_sum_for_payments = get_plan_sum_for_payments(db, year, month)
-        sum_payments_for_month = get_sum_payments_for_month(db, year, month)
-        payment_plan_performance_percent = round(
-            (
-                (sum_payments_for_month / plan_sum_for_payments * 100)
-                if plan_sum_for_payments
-                else 0
-            ),
-            2,
-        )
+    ttl = (
+        CURRENT_YEAR_PERFORMANCE_TTL
+        if year >= current_year
+        else PAST_YEAR_PERFORMANCE_TTL
+    )
+    cache_key = year_performance_key(year)
+    results = await get_cached(cache_key)
+    if results is None:
+        results = await compute_year_performance(db, year)
+        if all([await type_id(db, name) is not None for name in PLAN_CATEGORIES]):
+            await set_cached(cache_key, results, ttl)
+        else:
+            ttl = 0
+
+    headers = {"ETag": etag(results), "Cache-Control": f"public, max-age={ttl}"}
+    if is_not_modified(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return results
 
-        results.append(
-            {
-                "month": month,
-                "year": year,
-                "issuances": issuances,
-                "plan_sum_issuances": plan_sum_issuances,
-                "sum_issuances_for_month": sum_issuances_for_month,
-                "issuance_plan_percent": f"{issuance_plan_percent}%",
-                "payments_in_month": payments_in_month,
-                "plan_sum_for_payments": plan_sum_for_payments,
-                "sum_payments_for_month": sum_payments_for_month,
-                "payment_plan_performance_percent": f"{payment_plan_performance_percent}%",
-            }
-        )
 
-    total_sum_issuances = sum(item["sum_issuances_for_month"] for item in results)
-    plan_sum_issuances = sum(item["plan_sum_issuances"] for item in results)
-    total_plan_sum_for_payments = sum(item["plan_sum_for_payments"] for item in results)
-    total_sum_payments_for_month = sum(
-        item["sum_payments_for_month"] for item in results
+async def compute_year_performance(
+    db: AsyncSession, year: int
+) -> list[MonthPerformance | YearPerformance]:
+    """
+    Computes the monthly and total performance of a year from the database.
+
+    Returns:
+        list: The performance of the 12 months followed by the year's totals.
+    """
+    issuances_by_month, payments_by_month, plan_sums = (
+        await get_year_performance_aggregates(db, year, PLAN_CATEGORIES)
     )
 
-    for item in results:
-        item["sum_month_issuance_percent"] = (
-            f"{round((item['sum_issuances_for_month'] / total_sum_issuances * 100) if total_sum_issuances else 0, 2)}%"
-        )
-        item["sum_month_payment_percent"] = (
-            f"{round((item['sum_payments_for_month'] / total_sum_payments_for_month * 100) if total_sum_payments_for_month else 0, 2)}%"
+    months = pd.RangeIndex(1, 13, name="month")
+    issuances = pd.DataFrame.from_dict(
+        issuances_by_month,
+        orient="index",
+        columns=["issuances", "sum_issuances_for_month"],
+    ).reindex(months, fill_value=0)
+    # Months without payments get a Decimal sum too, so every sum has two decimals.
+    payments = pd.DataFrame.from_dict(
+        {month: payments_by_month.get(month, (0, from_cents(0))) for month in months},
+        orient="index",
+        columns=["payments_in_month", "sum_payments_for_month"],
+    )
+    plans = (
+        pd.Series(
+            plan_sums.values(),
+            index=pd.MultiIndex.from_tuples(plan_sums, names=["month", "category"]),
+            dtype="int64",
         )
+        .unstack(fill_value=0)
+        .reindex(index=months, columns=list(PLAN_CATEGORIES), fill_value=0)
+    )
 
-    results.append(
+    monthly = pd.DataFrame(
         {
-            "total_issuances": sum(item["issuances"] for item in results),
+            "month": months,
             "year": year,
-            "plan_sum_issuances": plan_sum_issuances,
-            "total_sum_issuances_for_month": total_sum_issuances,
-            "total_issuance_plan_percent": f"{round((total_sum_issuances / plan_sum_issuances * 100) if plan_sum_issuances else 0, 2)}%",
-            "total_payments_in_month": sum(
-                item["payments_in_month"] for item in results
-            ),
-            "total_plan_sum_for_payments": total_plan_sum_for_payments,
-            "total_sum_payments_for_month": total_sum_payments_for_month,
-            "total_payment_plan_performance_percent": f"{round((total_sum_payments_for_month / total_plan_sum_for_payments * 100) if total_plan_sum_for_payments else 0, 2)}%",
-        }
+            "issuances": issuances["issuances"],
+            "plan_sum_issuances": plans["issuance"],
+            "sum_issuances_for_month": issuances["sum_issuances_for_month"],
+            "payments_in_month": payments["payments_in_month"],
+            "plan_sum_for_payments": plans["collection"],
+            "sum_payments_for_month": payments["sum_payments_for_month"],
+        },
+        index=months,
+    )
+    totals = monthly.drop(columns=["month", "year"]).sum().to_dict()
+
+    monthly.insert(
+        5,
+        "issuance_plan_percent",
+        percent(monthly["sum_issuances_for_month"], monthly["plan_sum_issuances"]),
+    )
+    monthly["payment_plan_performance_percent"] = percent(
+        monthly["sum_payments_for_month"], monthly["plan_sum_for_payments"]
+    )
+    monthly["sum_month_issuance_percent"] = percent(
+        monthly["sum_issuances_for_month"], totals["sum_issuances_for_month"]
+    )
+    monthly["sum_month_payment_percent"] = percent(
+        monthly["sum_payments_for_month"], totals["sum_payments_for_month"]
+    )
+
+    results = [MonthPerformance(**row) for row in monthly.to_dict("records")]
+    results.append(
+        YearPerformance(
+            total_issuances=totals["issuances"],
+            year=year,
+            plan_sum_issuances=totals["plan_sum_issuances"],
+            total_sum_issuances_for_month=totals["sum_issuances_for_month"],
+            total_issuance_plan_percent=percent(
+                pd.Series([totals["sum_issuances_for_month"]]),
+                totals["plan_sum_issuances"],
+            ).iat[0],
+            total_payments_in_month=totals["payments_in_month"],
+            total_plan_sum_for_payments=totals["plan_sum_for_payments"],
+            total_sum_payments_for_month=totals["sum_payments_for_month"],
+            total_payment_plan_performance_percent=percent(
+                pd.Series([totals["sum_payments_for_month"]]),
+                totals["plan_sum_for_payments"],
+            ).iat[0],
+        )
     )
 
     return results
@@ -1,5 +1,14 @@
-from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, String, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    DECIMAL,
+    BigInteger,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Date,
+)
+from sqlalchemy.orm import query_expression, relationship
 from core.database import Base
 
 
@@ -15,23 +24,46 @@ class Credits(Base):
         actual_return_date (date): The date the credit was actually returned.
         body (int): The principal amount of the credit.
         percent (decimal): The interest rate on the credit.
+        body_paid (int): The total of the credit's body payments, in cents.
+        percent_paid (int): The total of the credit's percent payments, in cents.
+        total_paid (int): The total of all the credit's payments, in cents.
+        overdue_days (int): The number of days the credit is past its return date,
+                            computed by the database when requested with
+                            `with_expression`; None otherwise.
+
+    The paid totals are denormalized from the payments table so that reads need
+    no aggregation; they are kept up to date by `refresh_credit_payment_totals`
+    whenever payments are written.
 
     Relationships:
         user (User): The user associated with the credit.
-        payments (Payments): The payments made towards the credit.
+        payments (Payments): The payments made towards the credit. Never loaded
+                             lazily; request them with `selectinload`.
     """
 
     __tablename__ = "credits"
+    # Serves the lookups of a user's credits, which also tell closed credits from
+    # open ones, so no single-column index on `user_id` is needed.
+    __table_args__ = (
+        Index("ix_credits_user_actual_return", "user_id", "actual_return_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     issuance_date = Column(Date, index=True)
     return_date = Column(Date, index=True)
     actual_return_date = Column(Date, index=True)
-    body = Column(Integer, index=True)
-    percent = Column(DECIMAL(7, 1), index=True)
+    body = Column(Integer)
+    percent = Column(DECIMAL(7, 1))
+    body_paid = Column(BigInteger, nullable=False, default=0, server_default="0")
+    percent_paid = Column(BigInteger, nullable=False, default=0, server_default="0")
+    total_paid = Column(BigInteger, nullable=False, default=0, server_default="0")
+    overdue_days = query_expression()
 
     user = relationship("User", back_populates="credits")
     payments = relationship(
-        "Payments", back_populates="credit", cascade="all, delete-orphan"
+        "Payments",
+        back_populates="credit",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
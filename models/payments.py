@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, Date
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, Date
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -12,7 +12,7 @@ class Payments(Base):
         credit_id (int): Foreign key linking the payment to a specific credit.
         payment_date (date): The date when the payment was made.
         type_id (int): Foreign key linking the payment to a specific type (e.g., body, interest) from the dictionary.
-        sum (decimal): The amount of money paid.
+        sum (int): The amount of money paid, in cents.
 
     Relationships:
         credit (Credits): The credit associated with the payment.
@@ -20,12 +20,17 @@ class Payments(Base):
     """
 
     __tablename__ = "payments"
+    # Covers the per-credit payment sums: `sum` is stored in the index leaves, so
+    # summing a credit's payments of a type needs no lookups into the table.
+    __table_args__ = (
+        Index("ix_payments_credit_type", "credit_id", "type_id", mssql_include=["sum"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     credit_id = Column(Integer, ForeignKey("credits.id"))
     payment_date = Column(Date, index=True)
     type_id = Column(Integer, ForeignKey("dictionary.id"))
-    sum = Column(DECIMAL(7, 2), index=True)
+    sum = Column(BigInteger)
 
     credit = relationship("Credits", back_populates="payments")
     dictionary = relationship("Dictionary", back_populates="payments")
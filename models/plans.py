@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Date
+from sqlalchemy import Column, ForeignKey, Integer, Date, UniqueConstraint
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -12,12 +12,16 @@ class Plans(Base):
         period (date): The date representing the period for the plan (e.g., the first day of the month).
         sum (int): The monetary value of the plan (e.g., the planned amount for the period).
         category_id (int): The foreign key linking the plan to a specific category in the dictionary.
+                           Only one plan may exist per period and category.
 
     Relationships:
         dictionary (Dictionary): The dictionary entry associated with the plan's category.
     """
 
     __tablename__ = "plans"
+    __table_args__ = (
+        UniqueConstraint("period", "category_id", name="uq_plans_period_category"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     period = Column(Date, index=True)
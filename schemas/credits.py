@@ -0,0 +1,50 @@
+from datetime import date
+from decimal import Decimal
+from typing import Literal
+from pydantic import BaseModel
+
+
+class ClosedCredit(BaseModel):
+    """
+    Represents a repaid credit in the `/user_credits` response.
+
+    Attributes:
+        issuance_date (date): The date the credit was issued.
+        is_closed (bool): Always True for closed credits.
+        actual_return_date (date): The date the credit was actually returned.
+        body (int): The principal amount of the credit.
+        percent (Decimal): The interest rate on the credit.
+        total_payments (Decimal): The total of all payments made towards the credit.
+    """
+
+    issuance_date: date
+    is_closed: Literal[True]
+    actual_return_date: date
+    body: int
+    percent: Decimal
+    total_payments: Decimal
+
+
+class OpenCredit(BaseModel):
+    """
+    Represents a credit that is not repaid yet in the `/user_credits` response.
+
+    Attributes:
+        issuance_date (date): The date the credit was issued.
+        is_closed (bool): Always False for open credits.
+        return_date (date): The date the credit is due to be returned.
+        overdue_days (int): The number of days the credit is overdue, 0 if none.
+        body (int): The principal amount of the credit.
+        percent (Decimal): The interest rate on the credit.
+        body_payments (Decimal): The total of the body payments made so far.
+        percent_payments (Decimal): The total of the percent payments made so far.
+    """
+
+    issuance_date: date
+    is_closed: Literal[False]
+    return_date: date
+    overdue_days: int
+    body: int
+    percent: Decimal
+    body_payments: Decimal
+    percent_payments: Decimal
@@ -0,0 +1,64 @@
+from decimal import Decimal
+from pydantic import BaseModel
+
+
+class MonthPerformance(BaseModel):
+    """
+    Represents the issuance and payment performance of one month.
+
+    Percentages are strings with two decimals and a "%" suffix, e.g. "45.50%".
+
+    Attributes:
+        month (int): The month number (1-12).
+        year (int): The year.
+        issuances (int): The number of credits issued in the month.
+        plan_sum_issuances (int): The planned issuance sum.
+        sum_issuances_for_month (int): The actual issued sum.
+        issuance_plan_percent (str): The actual issued sum relative to the plan.
+        payments_in_month (int): The number of payments made in the month.
+        plan_sum_for_payments (int): The planned collection sum.
+        sum_payments_for_month (Decimal): The actual collected sum.
+        payment_plan_performance_percent (str): The collected sum relative to the plan.
+        sum_month_issuance_percent (str): The month's share of the year's issued sum.
+        sum_month_payment_percent (str): The month's share of the year's collected sum.
+    """
+
+    month: int
+    year: int
+    issuances: int
+    plan_sum_issuances: int
+    sum_issuances_for_month: int
+    issuance_plan_percent: str
+    payments_in_month: int
+    plan_sum_for_payments: int
+    sum_payments_for_month: Decimal
+    payment_plan_performance_percent: str
+    sum_month_issuance_percent: str
+    sum_month_payment_percent: str
+
+
+class YearPerformance(BaseModel):
+    """
+    Represents the aggregated issuance and payment performance of a whole year.
+
+    Attributes:
+        total_issuances (int): The number of credits issued in the year.
+        year (int): The year.
+        plan_sum_issuances (int): The planned issuance sum.
+        total_sum_issuances_for_month (int): The actual issued sum.
+        total_issuance_plan_percent (str): The actual issued sum relative to the plan.
+        total_payments_in_month (int): The number of payments made in the year.
+        total_plan_sum_for_payments (int): The planned collection sum.
+        total_sum_payments_for_month (Decimal): The actual collected sum.
+        total_payment_plan_performance_percent (str): The collected sum relative to the plan.
+    """
+
+    total_issuances: int
+    year: int
+    plan_sum_issuances: int
+    total_sum_issuances_for_month: int
+    total_issuance_plan_percent: str
+    total_payments_in_month: int
+    total_plan_sum_for_payments: int
+    total_sum_payments_for_month: Decimal
+    total_payment_plan_performance_percent: str